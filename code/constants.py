@@ -57,6 +57,31 @@ UPSCALE_CONFIG = {
     }
 }
 
+# Resolution planner Configs
+PLANNER_CONFIG = {
+    "megapixels_options": ["0.25", "1"],
+    "upscale_scales": [2, 4],
+    # Width and height generated by flux-schnell for each aspect ratio and megapixels option
+    "native_sizes": {
+        "1:1": {"1": (1024, 1024), "0.25": (512, 512)},
+        "16:9": {"1": (1344, 768), "0.25": (672, 384)},
+        "21:9": {"1": (1536, 640), "0.25": (768, 320)},
+        "3:2": {"1": (1216, 832), "0.25": (608, 416)},
+        "2:3": {"1": (832, 1216), "0.25": (416, 608)},
+        "4:5": {"1": (896, 1088), "0.25": (448, 544)},
+        "5:4": {"1": (1088, 896), "0.25": (544, 448)},
+        "3:4": {"1": (896, 1152), "0.25": (448, 576)},
+        "4:3": {"1": (1152, 896), "0.25": (576, 448)},
+        "9:16": {"1": (768, 1344), "0.25": (384, 672)},
+        "9:21": {"1": (640, 1536), "0.25": (320, 768)}
+    },
+    "target_resolutions": {
+        "1K": 1024,
+        "2K": 2048,
+        "4K": 3840
+    }
+}
+
 # Replicate LLM Configs
 REPLICATE_LLM_CONFIG = {
     "model": "meta/meta-llama-3-8b-instruct",
@@ -81,3 +106,10 @@ PATH_TO_POS_PROCESS = "./pos_process"
 # Max retries
 MAX_RETRIES = 5
 
+# Watch mode Configs
+WATCH_CONFIG = {
+    "poll_interval": 2,
+    "stable_checks": 2,
+    "state_dir": ".watch_state"
+}
+
@@ -1,11 +1,15 @@
 import uuid
+from typing import Optional
 from run import ImageProcessor
 from input import PromptGenerator
 from pos_process import ImagePostProcessor
-from constants import LLM_TYPES
+from planner import ResolutionPlanner
+from constants import LLM_TYPES, PLANNER_CONFIG, REPLICATE_CONFIG, UPSCALE_CONFIG
 
 class CompleteFlowProcessor:
-    def __init__(self, theme: str, num_images: int, llm_type: str = LLM_TYPES["local"]):
+    def __init__(self, theme: str, num_images: int, llm_type: str = LLM_TYPES["local"],
+                 target_resolution: Optional[str] = None,
+                 aspect_ratio: str = REPLICATE_CONFIG["default_params"]["aspect_ratio"]):
         """
         Initialize the complete flow processor.
         
@@ -13,11 +17,15 @@ class CompleteFlowProcessor:
             theme (str): Theme for image generation
             num_images (int): Number of images to generate
             llm_type (str): Type of LLM to use (local or replicate)
+            target_resolution (Optional[str]): Target resolution ('1K', '2K', '4K' or long edge in pixels),
+                None keeps the default generation and 4x upscale
+            aspect_ratio (str): Aspect ratio of the final images
         """
         self.theme = theme
         self.num_images = self._validate_num_images(num_images)
         self.llm_type = self._validate_llm_type(llm_type)
         self.execution_uuid = str(uuid.uuid4())
+        self.plan = ResolutionPlanner(target_resolution, aspect_ratio).plan() if target_resolution else None
 
     @staticmethod
     def _validate_num_images(num: int) -> int:
@@ -67,7 +75,7 @@ class CompleteFlowProcessor:
             
             # Step 2: Generate Images
             print("\n=== Generating images ===")
-            image_processor = ImageProcessor(self.execution_uuid)
+            image_processor = ImageProcessor(self.execution_uuid, self.plan)
             image_processor.process_images()
 
             # Step 3: Generate Upscales
@@ -116,18 +124,56 @@ def main():
 
         llm_type = LLM_TYPES["local"] if llm_choice == "1" else LLM_TYPES["replicate"]
 
+        # Get target resolution input
+        resolutions = list(PLANNER_CONFIG["target_resolutions"])
+        print("\nChoose the TARGET RESOLUTION:")
+        for index, name in enumerate(resolutions, start=1):
+            print(f"{index} - {name}")
+        print(f"{len(resolutions) + 1} - Default (fixed {REPLICATE_CONFIG['default_params']['megapixels']} megapixel generation and {UPSCALE_CONFIG['default_params']['scale']}x upscale)")
+
+        while True:
+            resolution_choice = input(f"Enter your choice (1 to {len(resolutions) + 1}): ")
+            if resolution_choice in [str(i) for i in range(1, len(resolutions) + 2)]:
+                break
+            print(f"Please enter a number between 1 and {len(resolutions) + 1}")
+
+        target_resolution = None
+        aspect_ratio = REPLICATE_CONFIG["default_params"]["aspect_ratio"]
+        if int(resolution_choice) <= len(resolutions):
+            target_resolution = resolutions[int(resolution_choice) - 1]
+
+            # Get aspect ratio input
+            while True:
+                aspect_choice = input(f"Enter the aspect ratio ({', '.join(PLANNER_CONFIG['native_sizes'])}, default {aspect_ratio}): ")
+                if not aspect_choice:
+                    break
+                if aspect_choice in PLANNER_CONFIG["native_sizes"]:
+                    aspect_ratio = aspect_choice
+                    break
+                print("Please enter a supported aspect ratio")
+
         # Initialize and run complete flow
         processor = CompleteFlowProcessor(
             theme=theme,
             num_images=num_images,
-            llm_type=llm_type
+            llm_type=llm_type,
+            target_resolution=target_resolution,
+            aspect_ratio=aspect_ratio
         )
         
         # Show execution plan
         print("\nExecution plan:")
         print("1. Generate prompts using selected LLM")
-        print("2. Generate images from prompts")
-        print("3. Upscale generated images")
+        if processor.plan:
+            output = processor.plan["output"]
+            print(f"2. Generate images from prompts at {processor.plan['megapixels']} megapixels")
+            if processor.plan["upscale_scale"]:
+                print(f"3. Upscale generated images {processor.plan['upscale_scale']}x (up to {output['width']}x{output['height']})")
+            else:
+                print(f"3. Skip upscale, native size already reaches the target ({output['width']}x{output['height']})")
+        else:
+            print("2. Generate images from prompts")
+            print("3. Upscale generated images")
         print("4. Post-process upscaled images")
         
         # Confirm execution
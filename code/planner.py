@@ -0,0 +1,95 @@
+from typing import Dict, Tuple
+from constants import PLANNER_CONFIG, REPLICATE_CONFIG
+
+
+class ResolutionPlanner:
+    def __init__(self, target_resolution: str, aspect_ratio: str = REPLICATE_CONFIG["default_params"]["aspect_ratio"]):
+        """
+        Initialize the planner for a target output resolution.
+
+        Args:
+            target_resolution (str): Target resolution name ('1K', '2K' or '4K') or long edge in pixels
+            aspect_ratio (str): Aspect ratio of the final image (e.g. '16:9')
+        """
+        self.aspect_ratio = self._validate_aspect_ratio(aspect_ratio)
+        self.long_edge = self._validate_target_resolution(target_resolution)
+
+    @staticmethod
+    def _validate_aspect_ratio(aspect_ratio: str) -> str:
+        """Validate the aspect ratio"""
+        if aspect_ratio not in PLANNER_CONFIG["native_sizes"]:
+            raise ValueError(f"Unsupported aspect ratio: {aspect_ratio}")
+        return aspect_ratio
+
+    @staticmethod
+    def _validate_target_resolution(target_resolution: str) -> int:
+        """Validate the target resolution and return its long edge in pixels"""
+        if target_resolution in PLANNER_CONFIG["target_resolutions"]:
+            return PLANNER_CONFIG["target_resolutions"][target_resolution]
+        try:
+            long_edge = int(target_resolution)
+        except ValueError:
+            raise ValueError(f"Unsupported target resolution: {target_resolution}")
+        if long_edge <= 0:
+            raise ValueError(f"Unsupported target resolution: {target_resolution}")
+        return long_edge
+
+    def _ratio(self) -> float:
+        """Return the aspect ratio as width divided by height"""
+        width, height = self.aspect_ratio.split(":")
+        return int(width) / int(height)
+
+    def _target_dimensions(self) -> Tuple[int, int]:
+        """Return the target width and height"""
+        ratio = self._ratio()
+        if ratio >= 1:
+            return self.long_edge, round(self.long_edge / ratio)
+        return round(self.long_edge * ratio), self.long_edge
+
+    def _native_dimensions(self, megapixels: str) -> Tuple[int, int]:
+        """Return the width and height generated by the model for a megapixels option"""
+        return PLANNER_CONFIG["native_sizes"][self.aspect_ratio][megapixels]
+
+    def plan(self) -> Dict:
+        """
+        Pick the cheapest generation and upscale combination that reaches the target
+
+        Candidates are tried from no upscale to the largest scale, and from the
+        smallest to the largest megapixels option (1 megapixel at most), so the
+        first one whose real model size reaches the target is the cheapest.
+        When none does, the largest output is used.
+
+        Returns:
+            Dict: Plan with the generation params, the upscale scale (None to skip) and the expected sizes
+        """
+        target_width, target_height = self._target_dimensions()
+        scales = [None] + sorted(PLANNER_CONFIG["upscale_scales"])
+        megapixels_options = sorted(PLANNER_CONFIG["megapixels_options"], key=float)
+
+        chosen = None
+        for scale in scales:
+            for megapixels in megapixels_options:
+                native_width, native_height = self._native_dimensions(megapixels)
+                factor = scale or 1
+                if native_width * factor >= target_width and native_height * factor >= target_height:
+                    chosen = (megapixels, scale)
+                    break
+            if chosen:
+                break
+
+        if chosen is None:
+            chosen = (megapixels_options[-1], scales[-1])
+            print(f"Warning: target {target_width}x{target_height} can't be reached, using the largest output")
+
+        megapixels, scale = chosen
+        native_width, native_height = self._native_dimensions(megapixels)
+        factor = scale or 1
+        return {
+            "aspect_ratio": self.aspect_ratio,
+            "megapixels": megapixels,
+            "upscale_scale": scale,
+            "target": {"width": target_width, "height": target_height},
+            "native": {"width": native_width, "height": native_height},
+            "output": {"width": native_width * factor, "height": native_height * factor}
+        }
+
@@ -1,7 +1,9 @@
 import os
+import json
+import time
 import subprocess
-from typing import List
-from constants import MAX_RETRIES
+from typing import Dict, List, Optional
+from constants import MAX_RETRIES, WATCH_CONFIG
 class ImagePostProcessor:
     def __init__(self, uuid_dir: str, input_folder: str = "upscaly"):
         """
@@ -22,15 +24,18 @@ class ImagePostProcessor:
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
 
+    def _valid_extensions(self) -> tuple:
+        """Return the image extensions accepted for the input folder"""
+        return ('.png', '.jpg', '.jpeg') if self.input_folder == "output" else ('.png',)
+
     def _validate_input_directory(self) -> bool:
         """Validate if the input directory exists and contains images"""
         if not os.path.exists(self.input_dir):
             print(f"Error: Input directory not found: {self.input_dir}")
             return False
         
-        valid_extensions = ('.png', '.jpg', '.jpeg') if self.input_folder == "output" else ('.png',)
         image_files = [f for f in os.listdir(self.input_dir) 
-                      if f.endswith(valid_extensions)]
+                      if f.endswith(self._valid_extensions())]
         
         if not image_files:
             print(f"Error: No valid images found in directory: {self.input_dir}")
@@ -38,9 +43,19 @@ class ImagePostProcessor:
             
         return True
 
-    def _build_imagemagick_command(self) -> List[str]:
-        """Build the ImageMagick command with all parameters"""
-        file_pattern = "*.png" if self.input_folder == "upscaly" else "*.{png,jpg,jpeg}"
+    def _build_imagemagick_command(self, input_path: Optional[str] = None) -> List[str]:
+        """
+        Build the ImageMagick command with all parameters
+        
+        Args:
+            input_path (Optional[str]): Single file to process, defaults to every image in the input directory
+            
+        Returns:
+            List[str]: Command to be executed
+        """
+        if input_path is None:
+            file_pattern = "*.png" if self.input_folder == "upscaly" else "*.{png,jpg,jpeg}"
+            input_path = os.path.join(self.input_dir, file_pattern)
         return [
             "magick", "mogrify",
             "-sharpen", "0x1",
@@ -51,7 +66,7 @@ class ImagePostProcessor:
             "-attenuate", "0.5",
             "+noise", "Gaussian",
             "-path", self.output_dir,
-            os.path.join(self.input_dir, file_pattern)
+            input_path
         ]
 
     def _execute_imagemagick(self, command: List[str], retries: int = 0) -> bool:
@@ -105,6 +120,118 @@ class ImagePostProcessor:
         except Exception as e:
             print(f"Error during image processing: {str(e)}")
 
+    def _state_file_path(self) -> str:
+        """Return the path of the watch mode state file"""
+        return os.path.join("./pos_process", WATCH_CONFIG["state_dir"], f"{self.uuid_dir}.json")
+
+    def _load_watch_state(self) -> Dict[str, Dict]:
+        """Load the files already processed by previous watch runs, dropping failed ones so they are retried"""
+        state_path = self._state_file_path()
+        if not os.path.exists(state_path):
+            return {}
+
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error reading watch state, starting from scratch: {str(e)}")
+            return {}
+
+        if not isinstance(state, dict):
+            print("Error reading watch state, starting from scratch: state is not a JSON object")
+            return {}
+        return {filename: info for filename, info in state.items()
+                if isinstance(info, dict) and not info.get("failed")}
+
+    def _save_watch_state(self, state: Dict[str, Dict]) -> None:
+        """Persist the watch state, replacing the previous file atomically"""
+        state_path = self._state_file_path()
+        tmp_path = f"{state_path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(state_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(state, f, indent=4)
+            os.replace(tmp_path, state_path)
+        except OSError as e:
+            print(f"Error saving watch state, continuing to watch: {str(e)}")
+
+    def _find_ready_files(self, pending: Dict[str, Dict],
+                          state: Dict[str, Dict], stable_checks: int) -> List[str]:
+        """
+        Scan the input directory and return files whose size stopped changing
+        
+        Args:
+            pending (Dict[str, Dict]): Files seen but not yet stable, updated in place
+            state (Dict[str, Dict]): Files already processed or failed
+            stable_checks (int): Number of consecutive unchanged polls required
+            
+        Returns:
+            List[str]: Names of the files ready to be processed
+        """
+        ready = []
+        filenames = sorted(os.listdir(self.input_dir))
+        for filename in set(pending) - set(filenames):
+            del pending[filename]
+
+        for filename in filenames:
+            if not filename.endswith(self._valid_extensions()):
+                continue
+
+            try:
+                stat = os.stat(os.path.join(self.input_dir, filename))
+            except OSError:
+                continue
+
+            current = {"size": stat.st_size, "mtime": stat.st_mtime}
+            recorded = state.get(filename)
+            if recorded and recorded.get("size") == current["size"] and recorded.get("mtime") == current["mtime"]:
+                continue
+
+            previous = pending.get(filename)
+            if previous and previous["size"] == current["size"] and previous["mtime"] == current["mtime"]:
+                current["checks"] = previous["checks"] + 1
+            else:
+                current["checks"] = 0
+            pending[filename] = current
+
+            if current["size"] > 0 and current["checks"] >= stable_checks:
+                ready.append(filename)
+        return ready
+
+    def watch_images(self, poll_interval: float = WATCH_CONFIG["poll_interval"],
+                     stable_checks: int = WATCH_CONFIG["stable_checks"]) -> None:
+        """
+        Follow the input directory and post-process each new image once it is fully written
+        
+        Args:
+            poll_interval (float): Seconds between directory scans
+            stable_checks (int): Number of consecutive unchanged polls before a file is processed
+        """
+        state = self._load_watch_state()
+        pending = {}
+        print(f"Watching {self.input_dir} for new images (Ctrl+C to stop)...")
+
+        try:
+            while True:
+                if os.path.exists(self.input_dir):
+                    for filename in self._find_ready_files(pending, state, stable_checks):
+                        file_info = pending.pop(filename)
+                        command = self._build_imagemagick_command(os.path.join(self.input_dir, filename))
+                        success = self._execute_imagemagick(command)
+                        state[filename] = {"size": file_info["size"], "mtime": file_info["mtime"]}
+                        if success:
+                            print(f"Post-processed image saved in: {os.path.join(self.output_dir, filename)}")
+                        else:
+                            # Skip failed files for the rest of this run unless they change on disk,
+                            # a restart drops them from the state and retries them
+                            state[filename]["failed"] = True
+                            print(f"Failed to process {filename} after all retry attempts, waiting for it to change")
+                        self._save_watch_state(state)
+                time.sleep(poll_interval)
+
+        except KeyboardInterrupt:
+            print("\nWatch mode stopped")
+
 def main():
     try:
         uuid = input("Enter the UUID of the directory to be processed: ")
@@ -116,8 +243,16 @@ def main():
         
         input_folder = "upscaly" if folder_choice == "1" else "output"
         
+        print("\nChoose the mode:")
+        print("1 - Process all images once")
+        print("2 - Watch the folder and process new images as they arrive")
+        mode_choice = input("Enter your choice (1 or 2): ")
+        
         processor = ImagePostProcessor(uuid, input_folder)
-        processor.process_images()
+        if mode_choice == "2":
+            processor.watch_images()
+        else:
+            processor.process_images()
         
     except Exception as e:
         print(f"Error during execution: {str(e)}")
@@ -3,13 +3,16 @@ import os
 from datetime import datetime
 from dotenv import load_dotenv
 import json
+import shutil
 import requests
+from typing import Dict, Optional
 from constants import REPLICATE_CONFIG, UPSCALE_CONFIG, PATH_TO_PROMPTS, PATH_TO_OUTPUT, PATH_TO_UPSCALE, MAX_RETRIES
 
 
 class ImageProcessor:
-    def __init__(self, uuid_dir: str):
+    def __init__(self, uuid_dir: str, plan: Optional[Dict] = None):
         self.uuid_dir = uuid_dir
+        self.plan = plan
         load_dotenv()
         self.prompts_dir = os.path.join(PATH_TO_PROMPTS, uuid_dir)
         self.output_dir = os.path.join(PATH_TO_OUTPUT, uuid_dir)
@@ -43,13 +46,41 @@ class ImageProcessor:
         try:
             output = replicate.run(
                 REPLICATE_CONFIG["model"],
-                input=REPLICATE_CONFIG["default_params"] | {"prompt": prompt}
+                input=REPLICATE_CONFIG["default_params"] | self._generation_params() | {"prompt": prompt}
             )
             return output[0]
         except Exception as e:
             print(f"Error generating image (attempt {retries + 1}): {str(e)}")
             return self._generate_image(prompt, retries + 1)
 
+    def _generation_params(self) -> Dict:
+        """Return the generation params chosen by the plan"""
+        if self.plan is None:
+            return {}
+        return {
+            "megapixels": self.plan["megapixels"],
+            "aspect_ratio": self.plan["aspect_ratio"]
+        }
+
+    def _plan_path(self, image_path: str) -> str:
+        """Return the path of the plan file recorded next to an image"""
+        return f"{os.path.splitext(image_path)[0]}.plan.json"
+
+    def _save_plan(self, image_path: str) -> None:
+        """Record the plan used for an image"""
+        if self.plan is None:
+            return
+        with open(self._plan_path(image_path), "w", encoding="utf-8") as f:
+            json.dump(self.plan, f, ensure_ascii=False, indent=4)
+
+    def _load_upscale_scale(self, image_path: str) -> Optional[int]:
+        """Return the upscale scale recorded for an image, or the default one"""
+        plan_path = self._plan_path(image_path)
+        if not os.path.exists(plan_path):
+            return UPSCALE_CONFIG["default_params"]["scale"]
+        with open(plan_path, "r", encoding="utf-8") as f:
+            return json.load(f)["upscale_scale"]
+
     def _save_image(self, image_url: str) -> str:
         """Download and save the image"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -58,9 +89,10 @@ class ImageProcessor:
         response = requests.get(image_url)
         with open(output_path, "wb") as f:
             f.write(response.content)
+        self._save_plan(output_path)
         return output_path
 
-    def _upscale_image(self, input_path: str, retries: int = 0) -> str:
+    def _upscale_image(self, input_path: str, scale: int, retries: int = 0) -> str:
         """Perform upscale of an image"""
         if retries >= MAX_RETRIES:
             raise Exception("Maximum number of retries reached")
@@ -69,12 +101,12 @@ class ImageProcessor:
             with open(input_path, "rb") as f:
                 output = replicate.run(
                     UPSCALE_CONFIG["model"],
-                    input=UPSCALE_CONFIG["default_params"] | {"image": f}
+                    input=UPSCALE_CONFIG["default_params"] | {"image": f, "scale": scale}
                 )
             return str(output)
         except Exception as e:
             print(f"Error making upscale (attempt {retries + 1}): {str(e)}")
-            return self._upscale_image(input_path, retries + 1)
+            return self._upscale_image(input_path, scale, retries + 1)
 
     def _validate_output_directory(self) -> bool:
         """Validate if the output directory exists and contains images"""
@@ -117,8 +149,14 @@ class ImageProcessor:
                     output_path = os.path.join(self.upscale_dir, f"upscaled_{filename}")
 
                     try:
-                        print(f"Processing upscale of: {filename}")
-                        upscaled_url = self._upscale_image(input_path)
+                        scale = self._load_upscale_scale(input_path)
+                        if scale is None:
+                            shutil.copyfile(input_path, output_path)
+                            print(f"Upscale skipped by plan, image copied to: {output_path}")
+                            continue
+
+                        print(f"Processing {scale}x upscale of: {filename}")
+                        upscaled_url = self._upscale_image(input_path, scale)
                         
                         response = requests.get(upscaled_url)
                         with open(output_path, "wb") as f:
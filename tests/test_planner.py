@@ -0,0 +1,46 @@
+import pytest
+from planner import ResolutionPlanner
+
+
+@pytest.mark.parametrize("target, aspect_ratio, megapixels, scale, native", [
+    ("512", "1:1", "0.25", None, (512, 512)),
+    ("513", "1:1", "1", None, (1024, 1024)),
+    ("1344", "16:9", "1", None, (1344, 768)),
+    ("1345", "16:9", "1", 2, (1344, 768)),
+    ("1494", "9:21", "1", None, (640, 1536)),
+    ("1495", "9:21", "1", 2, (640, 1536)),
+    ("1536", "9:21", "1", 2, (640, 1536)),
+    ("2688", "16:9", "1", 2, (1344, 768)),
+    ("2689", "16:9", "1", 4, (1344, 768)),
+    ("2K", "1:1", "1", 2, (1024, 1024)),
+    ("4K", "1:1", "1", 4, (1024, 1024)),
+])
+def test_plan_picks_cheapest_path(target, aspect_ratio, megapixels, scale, native):
+    plan = ResolutionPlanner(target, aspect_ratio).plan()
+    factor = scale or 1
+    assert plan["megapixels"] == megapixels
+    assert plan["upscale_scale"] == scale
+    assert plan["native"] == {"width": native[0], "height": native[1]}
+    assert plan["output"] == {"width": native[0] * factor, "height": native[1] * factor}
+
+
+def test_plan_output_reaches_target():
+    plan = ResolutionPlanner("1536", "9:21").plan()
+    assert plan["output"]["width"] >= plan["target"]["width"]
+    assert plan["output"]["height"] >= plan["target"]["height"]
+
+
+def test_unreachable_target_uses_largest_output():
+    plan = ResolutionPlanner("8000", "1:1").plan()
+    assert plan["megapixels"] == "1"
+    assert plan["upscale_scale"] == 4
+
+
+@pytest.mark.parametrize("target, aspect_ratio", [
+    ("8K", "1:1"),
+    ("0", "1:1"),
+    ("2K", "7:3"),
+])
+def test_invalid_input_raises(target, aspect_ratio):
+    with pytest.raises(ValueError):
+        ResolutionPlanner(target, aspect_ratio)
@@ -0,0 +1,83 @@
+import os
+import pytest
+from pos_process import ImagePostProcessor
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(os.path.join("upscaly", "uuid"))
+    return ImagePostProcessor("uuid", "upscaly")
+
+
+def write_image(processor, filename, content=b"image"):
+    path = os.path.join(processor.input_dir, filename)
+    with open(path, "wb") as f:
+        f.write(content)
+    return path
+
+
+def test_file_is_ready_after_stable_checks(processor):
+    write_image(processor, "a.png")
+    pending = {}
+
+    assert processor._find_ready_files(pending, {}, 2) == []
+    assert processor._find_ready_files(pending, {}, 2) == []
+    assert processor._find_ready_files(pending, {}, 2) == ["a.png"]
+
+
+def test_size_change_resets_checks(processor):
+    write_image(processor, "a.png")
+    pending = {}
+
+    processor._find_ready_files(pending, {}, 2)
+    processor._find_ready_files(pending, {}, 2)
+    write_image(processor, "a.png", b"image with more bytes")
+
+    assert processor._find_ready_files(pending, {}, 2) == []
+    assert pending["a.png"]["checks"] == 0
+
+
+def test_recorded_file_is_skipped_until_it_changes(processor):
+    path = write_image(processor, "a.png")
+    stat = os.stat(path)
+    state = {"a.png": {"size": stat.st_size, "mtime": stat.st_mtime}}
+    pending = {}
+
+    assert processor._find_ready_files(pending, state, 0) == []
+    assert pending == {}
+
+    write_image(processor, "a.png", b"image with more bytes")
+    assert processor._find_ready_files(pending, state, 0) == ["a.png"]
+
+
+def test_pending_entry_is_dropped_when_file_disappears(processor):
+    path = write_image(processor, "a.png")
+    pending = {}
+
+    processor._find_ready_files(pending, {}, 2)
+    os.remove(path)
+
+    assert processor._find_ready_files(pending, {}, 2) == []
+    assert pending == {}
+
+
+def test_state_round_trip_drops_failed_entries(processor):
+    state = {
+        "a.png": {"size": 5, "mtime": 1.5},
+        "b.png": {"size": 5, "mtime": 2.5, "failed": True}
+    }
+    processor._save_watch_state(state)
+
+    assert os.listdir(processor.output_dir) == []
+    assert processor._load_watch_state() == {"a.png": {"size": 5, "mtime": 1.5}}
+
+
+@pytest.mark.parametrize("content", ["{not json", "[]"])
+def test_invalid_state_file_starts_from_scratch(processor, content):
+    state_path = processor._state_file_path()
+    os.makedirs(os.path.dirname(state_path), exist_ok=True)
+    with open(state_path, "w", encoding="utf-8") as f:
+        f.write(content)
+
+    assert processor._load_watch_state() == {}